@@ -28,8 +28,7 @@
 
 import argparse
 import math
-from functools import lru_cache
-from typing import Tuple, Type
+from typing import Optional, Tuple, Type
 
 import cuda.bindings.driver as cuda
 
@@ -51,6 +50,7 @@ This GEMM kernel supports the following features:
     - Threadblock rasterization to improve data re-use
     - Supports multi-stage pipeline to overlap computation and memory access
     - Implements shared memory buffering for epilogue to increase coalesced global memory access
+    - Optional persistent mode where one CTA per SM loops over the output tiles
 
 This GEMM works as follows:
 1. Load A and B matrices from global memory (GMEM) to shared memory (SMEM) using asynchronous copies.
@@ -93,6 +93,8 @@ Constraints:
 * Supported output data types: fp16
 * Support accumulator data types: f32/f16
 * Default tile shape is 128x128x32 for fp16/bf16 and 128x128x64 for fp8
+* Number of pipeline stages (--num_stages, default 4) must be at least 3 and
+  is clamped to what fits into shared memory
 * Atom layout's MNK shape is set so that tile shape can be divided by MMA
   instruction shape
 * The contiguous dimension of A/B/C tensors must be at least 16 bytes aligned,
@@ -115,6 +117,10 @@ class TensorOpGemm:
         acc_dtype: Type[cutlass.Numeric],
         atom_layout_mnk: Tuple[int, int, int],
         is_m_major_c: bool = False,
+        swizzle_mode: str = "xor",
+        max_active_ctas: Optional[int] = None,
+        cta_tiler: Optional[Tuple[int, int, int]] = None,
+        num_stages: int = 4,
     ):
         self.ab_dtype = ab_dtype
         self.c_dtype = c_dtype
@@ -123,39 +129,117 @@ class TensorOpGemm:
         assert self.ab_dtype in self._FP16_BF16_DTYPES + self._FP8_DTYPES, (
             "ab_dtype must be one of Float16, BFloat16, Float8E4M3FN, Float8E5M2"
         )
-        self.cta_tiler = (
-            self._CTA_TILER_FP8 if self.is_fp8 else self._CTA_TILER_FP16_BF16
+        # Float16 accumulation halves the accumulator registers and is useful
+        # for memory bound shapes with small K; BFloat16 MMAs only support
+        # Float32 accumulation
+        assert self.acc_dtype in (cutlass.Float32, cutlass.Float16), (
+            "acc_dtype must be one of Float32, Float16"
         )
-        self.num_stages = 4
+        assert self.ab_dtype != cutlass.BFloat16 or self.acc_dtype == cutlass.Float32, (
+            "BFloat16 ab_dtype requires Float32 acc_dtype"
+        )
+        if cta_tiler is None:
+            cta_tiler = (
+                self._CTA_TILER_FP8 if self.is_fp8 else self._CTA_TILER_FP16_BF16
+            )
+        self.cta_tiler = tuple(cta_tiler)
+        assert swizzle_mode in ("xor", "packed"), (
+            "swizzle_mode must be one of xor, packed"
+        )
+        self.swizzle_mode = swizzle_mode
+        # None launches one CTA per output tile; otherwise launch at most this
+        # many persistent CTAs that loop over the output tiles
+        assert max_active_ctas is None or max_active_ctas > 0, (
+            "max_active_ctas must be positive"
+        )
+        self.max_active_ctas = max_active_ctas
         self.atom_layout_mnk = atom_layout_mnk
         atom_lay_M, atom_lay_N, atom_lay_K = self.atom_layout_mnk
         self.num_threads = atom_lay_M * atom_lay_N * atom_lay_K * 32
 
         self.bM, self.bN, self.bK = self.cta_tiler
+        ab_stage_bytes, smem_capacity = self._smem_budget(ab_dtype, self.cta_tiler)
+        self.num_stages = self.clamp_num_stages(ab_dtype, num_stages, self.cta_tiler)
+        # The A/B pipeline buffers and the C epilogue buffer alias the same
+        # shared memory, so a CTA needs the larger of the two. The sizes only
+        # depend on dtypes, tile shape and num_stages, so compute them once
+        # here instead of on every trace. sB starts right after sA, at an
+        # offset (in elements) that is static as well
+        self._sB_smem_offset = self.bM * self.bK * self.num_stages
+        ab_smem_bytes = ab_stage_bytes * self.num_stages
+        c_smem_bytes = self.bM * self.bN * self.c_dtype.width // 8
+        self._smem_bytes = max(ab_smem_bytes, c_smem_bytes)
+        assert self._smem_bytes <= smem_capacity, (
+            "the CTA tile does not fit into shared memory"
+        )
         self.mma_inst_shape = (
             self._MMA_SHAPE_FP8 if self.is_fp8 else self._MMA_SHAPE_FP16_BF16
         )
         mmaM, mmaN, mmaK = self.mma_inst_shape
 
         # M-major C uses C^T = B^T * A^T, swapping atom layout M/N roles.
+        # The tiled MMA's N mode is twice the atom layout's N extent (see
+        # permutation_mnk in __call__), so bN must divide by that.
         if is_m_major_c:
             assert self.bM % (atom_lay_N * mmaM) == 0, (
                 "bM must be divisible by MMA instruction"
             )
-            assert self.bN % (atom_lay_M * mmaN) == 0, (
+            assert self.bN % (atom_lay_M * mmaN * 2) == 0, (
                 "bN must be divisible by MMA instruction"
             )
         else:
             assert self.bM % (atom_lay_M * mmaM) == 0, (
                 "bM must be divisible by MMA instruction"
             )
-            assert self.bN % (atom_lay_N * mmaN) == 0, (
+            assert self.bN % (atom_lay_N * mmaN * 2) == 0, (
                 "bN must be divisible by MMA instruction"
             )
         assert atom_lay_K == 1, "this example does not support atom layout K > 1"
         assert self.bK % mmaK == 0, "bK must be divisible by MMA instruction"
         assert self.num_stages >= 3, "num_stages must be greater than or equal to 3"
 
+    @classmethod
+    def clamp_num_stages(
+        cls,
+        ab_dtype: Type[cutlass.Numeric],
+        num_stages: int,
+        cta_tiler: Optional[Tuple[int, int, int]] = None,
+    ) -> int:
+        """
+        Clamp the number of pipeline stages to the shared memory of the device.
+
+        Deeper pipelines hide more cp.async latency on K heavy problems, but
+        every stage holds a bM x bK tile of A and a bN x bK tile of B. The C
+        epilogue buffer aliases the A/B stages, so it does not reduce the
+        budget.
+
+        :param ab_dtype: Data type for input tensors A and B.
+        :type ab_dtype: Type[cutlass.Numeric]
+        :param num_stages: Requested number of pipeline stages.
+        :type num_stages: int
+        :param cta_tiler: CTA tile shape (M, N, K), defaults to the per-dtype default tile.
+        :type cta_tiler: Optional[Tuple[int, int, int]], optional
+
+        :return: The number of stages the kernel is built with.
+        :rtype: int
+        """
+        if cta_tiler is None:
+            cta_tiler = (
+                cls._CTA_TILER_FP8
+                if ab_dtype in cls._FP8_DTYPES
+                else cls._CTA_TILER_FP16_BF16
+            )
+        ab_stage_bytes, smem_capacity = cls._smem_budget(ab_dtype, cta_tiler)
+        return min(num_stages, smem_capacity // ab_stage_bytes)
+
+    @staticmethod
+    def _smem_budget(ab_dtype, cta_tiler):
+        # (bytes of one A/B pipeline stage, shared memory capacity of the
+        # target device)
+        bM, bN, bK = cta_tiler
+        ab_stage_bytes = (bM + bN) * bK * ab_dtype.width // 8
+        return ab_stage_bytes, utils.get_smem_capacity_in_bytes()
+
     @cute.jit
     def __call__(
         self,
@@ -199,7 +283,9 @@ class TensorOpGemm:
         # size and num stages (stages are used for K dimension) that is also
         # sectioned into 64x8 or 8x32 layout atoms. The swizzle is set so that
         # the atom for the shared memory -> register copy does not encounter
-        # bank conflicts
+        # bank conflicts. With swizzle_mode "packed", K-major operands instead
+        # use unswizzled layout atoms together with a matching G2S thread
+        # order (see _make_smem_layout_AB and _make_gmem_tiled_copy_AB)
 
         # assume the input is 16B align
         ab_copy_bits = 128
@@ -208,12 +294,14 @@ class TensorOpGemm:
             self.a_major_mode,
             ab_copy_bits,
             (self.cta_tiler[0], self.cta_tiler[2], self.num_stages),
+            self.swizzle_mode,
         )
         sB_layout, sB_swizzle = self._make_smem_layout_AB(
             mB.element_type,
             self.b_major_mode,
             ab_copy_bits,
             (self.cta_tiler[1], self.cta_tiler[2], self.num_stages),
+            self.swizzle_mode,
         )
 
         # Creates a similar layout but without num_stages or layout atoms
@@ -231,7 +319,8 @@ class TensorOpGemm:
         # transfer between global and shared memory.
         # ///////////////////////////////////////////////////////////////////////////////
 
-        # Create a copy atom for a global to shared memory asynchronous copy
+        # Create a copy atom for a global to shared memory asynchronous copy.
+        # The copy is always 16B, so it can bypass L1 (cp.async.cg)
         atom_async_copy = cute.make_copy_atom(
             cute.nvgpu.cpasync.CopyG2SOp(cache_mode=cute.nvgpu.LoadCacheMode.GLOBAL),
             mA.element_type,
@@ -241,13 +330,23 @@ class TensorOpGemm:
         # Create thread layouts for tiled copy from the copy atom where the
         # thread layout simply follows the leading dimension of the tensor
         tiled_copy_A = self._make_gmem_tiled_copy_AB(
-            atom_async_copy, mA.element_type, self.a_major_mode, ab_copy_bits
+            atom_async_copy,
+            mA.element_type,
+            self.a_major_mode,
+            ab_copy_bits,
+            self.cta_tiler[0],
         )
         tiled_copy_B = self._make_gmem_tiled_copy_AB(
-            atom_async_copy, mB.element_type, self.b_major_mode, ab_copy_bits
+            atom_async_copy,
+            mB.element_type,
+            self.b_major_mode,
+            ab_copy_bits,
+            self.cta_tiler[1],
         )
 
-        # Creates a synchronous copy atom and thread layouts for the epilogue
+        # Creates a synchronous copy atom and thread layouts for the epilogue.
+        # Each thread stores 128 contiguous bits per copy so that the
+        # SMEM -> GMEM copy lowers to vectorized st.global.v4 stores
         c_copy_bits = 128
         atom_sync_copy = cute.make_copy_atom(
             cute.nvgpu.CopyUniversalOp(),
@@ -273,8 +372,10 @@ class TensorOpGemm:
 
         permutation_mnk = (
             atom_layout_mnk[0] * self.mma_inst_shape[0],
-            # if atom layout's N-mode is 1, to leverage the largest coalesced
-            # shared memory -> register copy, set the tiled mma's N mode to 16
+            # Double the N mode so each warp covers two MMA atoms along N.
+            # The x4 ldmatrix used for the shared memory -> register copy of
+            # B loads 16 columns per warp, so this is needed for every atom
+            # layout, not only when the atom layout's N-mode is 1
             atom_layout_mnk[1] * self.mma_inst_shape[1] * 2,
             atom_layout_mnk[2] * self.mma_inst_shape[2],
         )
@@ -293,21 +394,36 @@ class TensorOpGemm:
         grid_dim = cute.ceil_div(mC.shape, (self.bM, self.bN, 1))
 
         # Add threadblock rasterization to improve re-use of data
-        raster_factor = 1
         grid_dim_n = cute.size(grid_dim[1])
-        # Thresholds picked so that it doesn't cause too many no-op CTAs
-        if grid_dim_n > 5:
-            raster_factor = 8
-        elif grid_dim_n > 2:
-            raster_factor = 4
-        elif grid_dim_n > 1:
-            raster_factor = 2
+        # Thresholds picked so that it doesn't cause too many no-op CTAs:
+        # grid_dim_n == 1 -> 1, == 2 -> 2, 3..5 -> 4, > 5 -> 8.
+        # Summing the comparisons keeps the traced IR straight-line instead
+        # of emitting a chain of nested conditionals on a dynamic value
+        raster_factor = (
+            1
+            + cutlass.Int32(grid_dim_n > 1)
+            + cutlass.Int32(grid_dim_n > 2) * 2
+            + cutlass.Int32(grid_dim_n > 5) * 4
+        )
         rasterization_remap_grid_dim = (
             cute.size(grid_dim[0]) * raster_factor,
             (cute.size(grid_dim[1]) + raster_factor - 1) // raster_factor,
             cute.size(grid_dim[2]),
         )
 
+        # Persistent mode launches at most max_active_ctas CTAs, which loop
+        # over the tiles of the rasterized grid
+        if cutlass.const_expr(self.max_active_ctas is not None):
+            launch_grid_dim = (
+                cutlass.min(
+                    cute.size(rasterization_remap_grid_dim), self.max_active_ctas
+                ),
+                1,
+                1,
+            )
+        else:
+            launch_grid_dim = rasterization_remap_grid_dim
+
         self.kernel(
             mA,
             mB,
@@ -324,8 +440,9 @@ class TensorOpGemm:
             raster_factor,
             epilogue_op,
         ).launch(
-            grid=rasterization_remap_grid_dim,
+            grid=launch_grid_dim,
             block=[self.num_threads, 1, 1],
+            smem=self._smem_bytes,
             stream=stream,
         )
 
@@ -347,17 +464,83 @@ class TensorOpGemm:
         rasterization_factor: cutlass.Int32,
         epilogue_op: cutlass.Constexpr = lambda x: x,
     ):
-        # Thread index, block index
-        tidx, _, _ = cute.arch.thread_idx()
+        tile_args = (
+            mA,
+            mB,
+            mC,
+            sA_layout,
+            sA_swizzle,
+            sB_layout,
+            sB_swizzle,
+            sC_layout,
+            tiled_copy_A,
+            tiled_copy_B,
+            tiled_copy_C,
+            tiled_mma,
+            rasterization_factor,
+        )
+        # Block index
         bidx, bidy, bidz = cute.arch.block_idx()
+        if cutlass.const_expr(self.max_active_ctas is not None):
+            # Persistent CTAs walk the (rasterized) grid that would otherwise
+            # be launched, with a grid-stride loop over its linearized index
+            grid_dim = cute.ceil_div(mC.shape, (self.bM, self.bN, 1))
+            remap_x = cute.size(grid_dim[0]) * rasterization_factor
+            remap_y = (
+                cute.size(grid_dim[1]) + rasterization_factor - 1
+            ) // rasterization_factor
+            num_tiles = remap_x * remap_y * cute.size(grid_dim[2])
+            num_ctas, _, _ = cute.arch.grid_dim()
+            for tile_idx in cutlass.range(bidx, num_tiles, num_ctas):
+                self.compute_one_tile(
+                    *tile_args,
+                    tile_idx % remap_x,
+                    (tile_idx // remap_x) % remap_y,
+                    tile_idx // (remap_x * remap_y),
+                    epilogue_op,
+                )
+                # sC aliases sA/sB: every thread must be done reading sC
+                # before the next tile's prologue overwrites shared memory
+                cute.arch.sync_threads()
+        else:
+            self.compute_one_tile(*tile_args, bidx, bidy, bidz, epilogue_op)
+        return
+
+    @cute.jit
+    def compute_one_tile(
+        self,
+        mA: cute.Tensor,
+        mB: cute.Tensor,
+        mC: cute.Tensor,
+        sA_layout: cute.Layout,
+        sA_swizzle: cute.Swizzle,
+        sB_layout: cute.Layout,
+        sB_swizzle: cute.Swizzle,
+        sC_layout: cute.ComposedLayout,
+        tiled_copy_A: cute.TiledCopy,
+        tiled_copy_B: cute.TiledCopy,
+        tiled_copy_C: cute.TiledCopy,
+        tiled_mma: cute.TiledMma,
+        rasterization_factor: cutlass.Int32,
+        bidx: cutlass.Int32,
+        bidy: cutlass.Int32,
+        bidz: cutlass.Int32,
+        epilogue_op: cutlass.Constexpr = lambda x: x,
+    ):
+        """Compute the output tile mapped to block index (bidx, bidy, bidz)
+        of the rasterized grid.
+        """
+        # Thread index
+        tidx, _, _ = cute.arch.thread_idx()
         grid_dim = cute.ceil_div(mC.shape, (self.bM, self.bN, 1))
         offset_tile_x, offset_tile_y = self.raster_tile(
             bidx, bidy, rasterization_factor
         )
-        # Early exit if CTA is out of range
-        if grid_dim[0] <= offset_tile_x or grid_dim[1] <= offset_tile_y:
-            pass
-        else:
+        # Only compute tiles that are in range. A CTA whose remapped tile
+        # falls outside of C (rasterization pads the grid) skips straight
+        # to the end of the kernel and retires without touching memory; a
+        # persistent CTA moves on to its next tile
+        if offset_tile_x < grid_dim[0] and offset_tile_y < grid_dim[1]:
             tiler_coord = (offset_tile_x, offset_tile_y, None)
 
             # ///////////////////////////////////////////////////////////////////////////////
@@ -401,9 +584,18 @@ class TensorOpGemm:
             # input is 16B aligned
             gA = cute.make_tensor(gA.iterator.align(16), gA.layout)
             gB = cute.make_tensor(gB.iterator.align(16), gB.layout)
+            # output is 16B aligned as well, so the 128-bit epilogue stores
+            # are not split into narrower ones
+            gC = cute.make_tensor(gC.iterator.align(16), gC.layout)
+
+            # Number of leading k coordinates of the first (irregular) k-tile
+            # that lie outside of the tensor after the shift above
+            k_residue_pad = -residual_k
 
             # Construct identity layout for sA and sB (mirrors global tensors,
-            # used for predication only)
+            # used for predication only). These are not shifted by residual_k:
+            # the k coordinates of the first k-tile stay in [0, BLK_K) and are
+            # compared against k_residue_pad instead
             mcA = cute.make_identity_tensor(mA.layout.shape)
             mcB = cute.make_identity_tensor(mB.layout.shape)
             cA = cute.local_tile(
@@ -419,45 +611,31 @@ class TensorOpGemm:
                 proj=(None, 1, 1),
             )
 
-            cA = cute.domain_offset((0, residual_k, 0), cA)
-            cB = cute.domain_offset((0, residual_k, 0), cB)
-
             # ///////////////////////////////////////////////////////////////////////////////
             # Create shared memory buffers and get the appropriate fragments for this thread.
             # sA:   (BLK_M, BLK_K, PIPE)       , sB:   (BLK_N, BLK_K, PIPE)
             # tAgA: (CPY, CPY_M, CPY_K, k)     , tBgB: (CPY, CPY_N, CPY_K, k)
             # tAsA: (CPY, CPY_M, CPY_K, PIPE)  , tBsB: (CPY, CPY_N, CPY_K, PIPE)
             # ///////////////////////////////////////////////////////////////////////////////
-            @cute.struct
-            class SharedStorageAB:
-                a: cute.struct.Align[
-                    cute.struct.MemRange[mA.element_type, cute.cosize(sA_layout)],
-                    16,
-                ]
-                b: cute.struct.Align[
-                    cute.struct.MemRange[mB.element_type, cute.cosize(sB_layout)],
-                    16,
-                ]
-
-            @cute.struct
-            class SharedStorageC:
-                c: cute.struct.Align[
-                    cute.struct.MemRange[mC.element_type, cute.cosize(sC_layout)],
-                    16,
-                ]
-
-            # Shared memory buffer
-            smem = cutlass.utils.SmemAllocator()
-            # Shared memory allocated for operations with A, B will be
+            # Shared memory buffer: sA and sB sit at static offsets of the
+            # dynamic shared memory sized in __init__, so no allocator
+            # bookkeeping is traced. Shared memory used for A, B will be
             # overwritten for operations on C. This is to improve performance
             # by reducing the size of shared memory requested by each block
-            storage = smem.allocate(
-                max(SharedStorageAB.size_in_bytes(), SharedStorageC.size_in_bytes()),
-                byte_alignment=16,
+            smem_ptr = cute.arch.get_dyn_smem(mA.element_type, alignment=16)
+            sA = cute.make_tensor(
+                cute.recast_ptr(smem_ptr, sA_swizzle, dtype=mA.element_type),
+                sA_layout,
+            )
+            sB = cute.make_tensor(
+                cute.recast_ptr(
+                    smem_ptr + self._sB_smem_offset, sB_swizzle, dtype=mB.element_type
+                ),
+                sB_layout,
+            )
+            sC = cute.make_tensor(
+                cute.recast_ptr(smem_ptr, dtype=mC.element_type), sC_layout
             )
-            sA = SharedStorageAB(storage).a.get_tensor(sA_layout, swizzle=sA_swizzle)
-            sB = SharedStorageAB(storage).b.get_tensor(sB_layout, swizzle=sB_swizzle)
-            sC = SharedStorageC(storage).c.get_tensor(sC_layout)
 
             thr_copy_A = tiled_copy_A.get_slice(tidx)
             thr_copy_B = tiled_copy_B.get_slice(tidx)
@@ -487,61 +665,35 @@ class TensorOpGemm:
             # For A and B, predication booleans along M/N are stored in a
             # predication tensor and along K is handled via a if/else branch.
 
-            # Allocate predicate tensors for M and N. Predication is checked
-            # at the granularity of a copy atom, so the predicate tensor does not
-            # need separate booleans for individual elements within a copy
-            # atom (for example, the elements of tAgA.shape[0][0].)
-            tApA = cute.make_rmem_tensor(
-                cute.make_layout(
-                    (
-                        tAgA.shape[0][1],
-                        cute.size(tAgA, mode=[1]),
-                        cute.size(tAgA, mode=[2]),
-                    ),
-                    stride=(cute.size(tAgA, mode=[1]), 1, 0),
-                ),
-                cutlass.Boolean,
+            # Allocate and set predicate tensors for M and N bounds
+            tApA = self._make_mn_predicate(
+                tAcA[None, None, 0, 0], cute.size(tAgA, mode=[2]), mA.shape[0]
             )
-            tBpB = cute.make_rmem_tensor(
-                cute.make_layout(
-                    (
-                        tBsB.shape[0][1],
-                        cute.size(tBsB, mode=[1]),
-                        cute.size(tBsB, mode=[2]),
-                    ),
-                    stride=(cute.size(tBsB, mode=[1]), 1, 0),
-                ),
-                cutlass.Boolean,
+            tBpB = self._make_mn_predicate(
+                tBcB[None, None, 0, 0], cute.size(tBsB, mode=[2]), mB.shape[0]
             )
-            # Set predicates for M/N bounds
-            for rest_v in range(tApA.shape[0]):
-                for m in range(tApA.shape[1]):
-                    tApA[rest_v, m, 0] = cute.elem_less(
-                        tAcA[(0, rest_v), m, 0, 0][0], mA.shape[0]
-                    )
-            for rest_v in range(tBpB.shape[0]):
-                for n in range(tBpB.shape[1]):
-                    tBpB[rest_v, n, 0] = cute.elem_less(
-                        tBcB[(0, rest_v), n, 0, 0][0], mB.shape[0]
-                    )
 
             # ///////////////////////////////////////////////////////////////////////////////
             # Prefetch Prologue
             # ///////////////////////////////////////////////////////////////////////////////
-            # Clear the smem tiles to account for predicated off loads
+            # Clear the smem tiles to account for predicated off loads. Each
+            # thread only clears the elements it later fills with cp.async,
+            # and no other thread reads them before the cp_async_wait_group +
+            # sync_threads that precedes the first shared memory -> register
+            # copy, so no barrier is needed between the clear and the copies
             tAsA.fill(0)
             tBsB.fill(0)
-            cute.arch.sync_threads()
             # Start async loads for the first k-tile. Here we take care of the k residue
-            # via if/else check along the k dimension. Because we shifted the identity tensor
-            # by the residue_k and because the identity tensor is a coord tensor, the
-            # values of any identity tensor element that is poison is less than -1
+            # via if/else check along the k dimension: a k-block is loaded only if its
+            # (unshifted) k coordinate is not within the first k_residue_pad columns
+            # that the shifted gA/gB tiles place before the start of the tensor.
+            # Only this residual k-tile is copied one k-block at a time
             num_smem_stages = cute.size(tAsA, mode=[3])
             k_tile_count = cute.size(tAgA, mode=[3])
             k_tile_index = cutlass.Int32(0)
 
             for k in range(tApA.shape[2]):
-                if cute.elem_less(cutlass.Int32(-1), tAcA[0, 0, k, 0][1]):
+                if cute.elem_less(k_residue_pad - 1, tAcA[0, 0, k, 0][1]):
                     cute.copy(
                         tiled_copy_A,
                         tAgA[None, None, k, k_tile_index],
@@ -549,7 +701,7 @@ class TensorOpGemm:
                         pred=tApA[None, None, k],
                     )
             for k in range(tBpB.shape[2]):
-                if cute.elem_less(cutlass.Int32(-1), tBcB[0, 0, k, 0][1]):
+                if cute.elem_less(k_residue_pad - 1, tBcB[0, 0, k, 0][1]):
                     cute.copy(
                         tiled_copy_B,
                         tBgB[None, None, k, k_tile_index],
@@ -559,7 +711,9 @@ class TensorOpGemm:
             k_tile_index = k_tile_index + 1
             cute.arch.cp_async_commit_group()
 
-            # Start async loads for rest of the k-tiles
+            # Start async loads for rest of the k-tiles. These are full k-tiles,
+            # so each is issued as a single copy over the whole (CPY, CPY_M/N,
+            # CPY_K) partition with the M/N predicate broadcast along K
             for k_tile in range(1, num_smem_stages - 1):
                 if k_tile == k_tile_count:
                     tApA.fill(0)
@@ -597,7 +751,12 @@ class TensorOpGemm:
             # Copy Atom A/B retiling
             # ///////////////////////////////////////////////////////////////////////////////
 
-            # Create the copy atoms for the copy from shared memory to register
+            # Create the copy atoms for the copy from shared memory to register.
+            # Each warp issues one ldmatrix.x4 per four 8x8 (8x16 for fp8)
+            # matrices, i.e. one instruction per 16x16 16-bit fragment, with
+            # .trans for M/N-major 16-bit operands. ldmatrix has no transposed
+            # form for 8-bit elements, so M/N-major fp8 operands fall back to
+            # element-wise copies
             if cutlass.const_expr(self.is_fp8):
                 if cutlass.const_expr(self.a_major_mode == utils.LayoutEnum.ROW_MAJOR):
                     atom_copy_s2r_A = cute.make_copy_atom(
@@ -782,43 +941,57 @@ class TensorOpGemm:
             )
             tCcC = thr_copy_C.partition_S(cC)
 
-            tCrC_epilogue = cute.make_fragment_like(tCsC_epilogue)
+            # Register staging buffer for a single N slice of the epilogue tile
+            tCrC_epilogue = cute.make_fragment_like(tCsC_epilogue[None, None, 0])
             # Wait for all writes to shared memory to finish before starting copies
             # using the new layouts
             cute.arch.sync_threads()
-            cute.autovec_copy(tCsC_epilogue, tCrC_epilogue)
 
             # Create predication tensor for m
-            tCpC = cute.make_rmem_tensor(
-                cute.make_layout(
-                    (
-                        tCgC_epilogue.shape[0][1],
-                        cute.size(tCgC_epilogue, mode=[1]),
-                        cute.size(tCgC_epilogue, mode=[2]),
-                    ),
-                    stride=(cute.size(tCgC_epilogue, mode=[1]), 1, 0),
-                ),
-                cutlass.Boolean,
+            tCpC = self._make_mn_predicate(
+                tCcC[None, None, 0], cute.size(tCgC_epilogue, mode=[2]), mC.shape[0]
             )
-            for rest_v in range(tCpC.shape[0]):
-                for m in range(tCpC.shape[1]):
-                    tCpC[rest_v, m, 0] = cute.elem_less(
-                        tCcC[(0, rest_v), m, 0][0], mC.shape[0]
-                    )
 
-            # Copy to global memory using better vectorization
+            # Copy to global memory using better vectorization. Each N slice is
+            # read back from shared memory right before it is stored, so global
+            # stores start draining after the first slice instead of after the
+            # whole tile has been staged in registers, and out of bounds slices
+            # are never read from shared memory at all
             for rest_v in range(tCpC.shape[0]):
                 for n in range(tCpC.shape[2]):
                     if cute.elem_less(tCcC[(0, rest_v), 0, n][1], mC.shape[1]):
+                        cute.autovec_copy(tCsC_epilogue[None, None, n], tCrC_epilogue)
                         cute.copy(
                             tiled_copy_C,
-                            tCrC_epilogue[None, None, n],
+                            tCrC_epilogue,
                             tCgC_epilogue[None, None, n],
                             pred=tCpC[None, None, n],
                         )
         return
 
-    def _make_smem_layout_AB(self, dtype, major_mode, copy_bits, smem_tiler):
+    def _make_smem_layout_AB(
+        self, dtype, major_mode, copy_bits, smem_tiler, swizzle_mode="xor"
+    ):
+        # PDSL: base_bits is in bytes (copy_bits / 8), not in elements
+        base_bits = int(math.log2(copy_bits // 8))
+        shift_bits = int(math.log2(copy_bits // dtype.width))
+
+        # Packed layout for K-major operands: each layout atom is 8 rows of a
+        # single 16B copy vector stored contiguously, so one atom spans all 32
+        # banks exactly once and each 8x8 (8x16 for fp8) matrix read by
+        # ldmatrix is one atom. The K chunks of a row are bM * 16B apart, so
+        # the cp.async fill is only conflict free because
+        # _make_gmem_tiled_copy_AB orders its threads M first in groups of 8
+        # for this layout; the default K first thread order would hit the
+        # same 4 banks with every K chunk. M-major fills walk M at a fixed K,
+        # which would serialize on this layout, so M-major operands keep the
+        # XOR swizzle
+        if swizzle_mode == "packed" and major_mode == utils.LayoutEnum.ROW_MAJOR:
+            copy_elems = copy_bits // dtype.width
+            layout_atom = cute.make_layout((8, copy_elems), stride=(copy_elems, 1))
+            layout = cute.tile_to_shape(layout_atom, smem_tiler, (0, 1, 2))
+            return layout, cute.make_swizzle(0, base_bits, shift_bits)
+
         major_mode_size = (
             smem_tiler[1] if major_mode == utils.LayoutEnum.ROW_MAJOR else smem_tiler[0]
         )
@@ -828,10 +1001,6 @@ class TensorOpGemm:
 
         swizzle_bits = int(math.log2(major_mode_size * dtype.width // copy_bits))
         swizzle_bits = min(swizzle_bits, 3)
-        # PDSL: base_bits is in bytes (copy_bits / 8), not in elements
-        base_bits = int(math.log2(copy_bits // 8))
-
-        shift_bits = int(math.log2(copy_bits // dtype.width))
         swizzle = cute.make_swizzle(swizzle_bits, base_bits, shift_bits)
 
         layout_atom_outer = (
@@ -875,15 +1044,32 @@ class TensorOpGemm:
         )
         return layout
 
-    def _make_gmem_tiled_copy_AB(self, atom_copy, dtype, major_mode, copy_bits):
+    def _make_gmem_tiled_copy_AB(
+        self, atom_copy, dtype, major_mode, copy_bits, tile_mn
+    ):
+        # tile_mn is the M (for A) or N (for B) extent of the CTA tile
         copy_elems = copy_bits // dtype.width
         shape_dim_1 = cute.size(self.bK) // copy_elems
         # thread layout for copy
         thread_layout = cute.make_layout(
             (self.num_threads // shape_dim_1, shape_dim_1), stride=(shape_dim_1, 1)
         )
+        if self.swizzle_mode == "packed" and major_mode == utils.LayoutEnum.ROW_MAJOR:
+            # Each group of 8 consecutive threads (one cp.async bank phase)
+            # copies the same K chunk of 8 consecutive rows, i.e. one packed
+            # 128B smem atom. The groups then walk K before moving on to the
+            # next 8 rows, so every warp still reads whole 32B sectors of
+            # each gmem row it touches
+            assert self.num_threads % (8 * shape_dim_1) == 0, (
+                "packed swizzle_mode needs 8 * bK / copy_elems to divide the "
+                "number of threads"
+            )
+            thread_layout = cute.make_layout(
+                ((8, self.num_threads // (8 * shape_dim_1)), shape_dim_1),
+                stride=((1, 8 * shape_dim_1), 8),
+            )
         if major_mode != utils.LayoutEnum.ROW_MAJOR:
-            shape_dim_0 = cute.size(self.bM) // copy_elems
+            shape_dim_0 = cute.size(tile_mn) // copy_elems
             thread_layout = cute.make_layout(
                 (shape_dim_0, self.num_threads // shape_dim_0), stride=(1, shape_dim_0)
             )
@@ -896,8 +1082,17 @@ class TensorOpGemm:
         return cute.make_tiled_copy_tv(atom_copy, thread_layout, value_layout)
 
     def _make_gmem_tiled_copy_C(self, atom_copy, dtype, major_mode, copy_bits):
+        assert copy_bits == 128, "epilogue stores must be 128-bit vectors"
         copy_elems = copy_bits // dtype.width
         shape_dim_1 = cute.size(self.bN) // copy_elems
+        # Every thread owns a whole 128-bit chunk of a row and the threads
+        # tile the CTA tile exactly, so no copy degenerates to scalar stores
+        assert self.num_threads % shape_dim_1 == 0, (
+            "bN / copy_elems must divide the number of threads"
+        )
+        assert self.bM % (self.num_threads // shape_dim_1) == 0, (
+            "the epilogue thread layout must divide bM"
+        )
         # thread layout for copy
         thread_layout = cute.make_layout(
             (self.num_threads // shape_dim_1, shape_dim_1), stride=(shape_dim_1, 1)
@@ -914,9 +1109,32 @@ class TensorOpGemm:
         )
         return cute.make_tiled_copy_tv(atom_copy, thread_layout, value_layout)
 
+    def _make_mn_predicate(self, tXcX_mn, extent_k, limit):
+        # One boolean per (rest_v, m) of the copy partition, broadcast along
+        # K by a stride-0 mode. Plain Python helper: the loops unroll at trace
+        # time so the fragment is written with static indices only
+        tXpX = cute.make_rmem_tensor(
+            cute.make_layout(
+                (tXcX_mn.shape[0][1], cute.size(tXcX_mn, mode=[1]), extent_k),
+                stride=(cute.size(tXcX_mn, mode=[1]), 1, 0),
+            ),
+            cutlass.Boolean,
+        )
+        for rest_v in range(tXpX.shape[0]):
+            for mn in range(tXpX.shape[1]):
+                tXpX[rest_v, mn, 0] = cute.elem_less(tXcX_mn[(0, rest_v), mn][0], limit)
+        return tXpX
+
     def raster_tile(self, i, j, f):
+        # Block column j covers the N tiles [j * f, (j + 1) * f). Consecutive
+        # blocks i walk the f N tiles of one M tile before moving on to the
+        # next M tile, so blocks that run together share their A tile. The
+        # walk over N snakes (zig-zags) on every other M tile so the blocks
+        # on either side of an M tile boundary also share their B tile
         new_i = i // f
-        new_j = (i % f) + (j * f)
+        r = i % f
+        # Branchless reversal: r on even M tiles, f - 1 - r on odd ones
+        new_j = r + (new_i % 2) * (f - 1 - 2 * r) + (j * f)
         return (new_i, new_j)
 
 
@@ -960,7 +1178,6 @@ def bmm(
     gemm_op(a, b, c, stream, epilogue_op)
 
 
-@lru_cache(maxsize=1)
 def prepare_tensors(
     mnkl: Tuple[int, int, int, int],
     ab_dtype: Type[cutlass.Numeric],
@@ -1066,9 +1283,43 @@ def mark_dynamic_layout(
     return a_, b_, c_
 
 
-@lru_cache(maxsize=1)
+# (cta_tiler, atom_layout_mnk, num_stages) candidates tried by autotune_bmm
+_AUTOTUNE_CONFIGS_FP16_BF16 = (
+    ((128, 128, 32), (2, 2, 1), 4),
+    ((128, 128, 32), (2, 2, 1), 3),
+    ((128, 64, 32), (2, 2, 1), 4),
+    ((64, 128, 32), (2, 2, 1), 4),
+    ((128, 128, 64), (2, 2, 1), 3),
+    ((64, 64, 64), (2, 2, 1), 3),
+)
+_AUTOTUNE_CONFIGS_FP8 = (
+    ((128, 128, 64), (2, 2, 1), 4),
+    ((128, 128, 64), (2, 2, 1), 3),
+    ((128, 64, 64), (2, 2, 1), 4),
+    ((64, 128, 64), (2, 2, 1), 4),
+    ((64, 64, 128), (2, 2, 1), 3),
+)
+
+
+def _major_modes(a, b, c) -> Tuple[str, str, str]:
+    """Return the (a_major, b_major, c_major) of bmm shaped (l, m, k),
+    (l, k, n) and (l, m, n) tensors.
+    """
+    return (
+        "k" if a.leading_dim == 2 else "m",
+        "n" if b.leading_dim == 2 else "k",
+        "n" if c.leading_dim == 2 else "m",
+    )
+
+
+# Compiled kernels keyed on everything the generated code is specialized on.
+# The tensors passed to the compiler have fully dynamic layouts, so a single
+# compilation serves every problem size sharing the same dtypes, majorness
+# and atom layout.
+_compiled_bmm_cache = {}
+
+
 def compile_bmm(
-    mnkl: Tuple[int, int, int, int],
     a: cute.Tensor,
     b: cute.Tensor,
     c: cute.Tensor,
@@ -1077,12 +1328,18 @@ def compile_bmm(
     acc_dtype: Type[cutlass.Numeric],
     atom_layout_mnk: Tuple[int, int, int],
     epilogue_op: cutlass.Constexpr = lambda x: x,
+    swizzle_mode: str = "xor",
+    max_active_ctas: Optional[int] = None,
+    cta_tiler: Optional[Tuple[int, int, int]] = None,
+    num_stages: int = 4,
 ):
     """
     Compile the BMM kernel with caching.
 
-    :param mnkl: Problem size as a tuple (M, N, K, L).
-    :type mnkl: Tuple[int, int, int, int]
+    The cache key is the kernel specialization (dtypes, major modes, atom
+    layout and epilogue), not the tensors themselves, so repeated calls
+    with new tensors of the same kind skip tracing and compilation entirely.
+
     :param a: Input tensor A.
     :type a: cute.Tensor
     :param b: Input tensor B.
@@ -1099,16 +1356,145 @@ def compile_bmm(
     :type atom_layout_mnk: Tuple[int, int, int]
     :param epilogue_op: Optional elementwise lambda function to apply to the output tensor.
     :type epilogue_op: cutlass.Constexpr, optional
+    :param swizzle_mode: Shared memory layout for A/B, "xor" or "packed", defaults to "xor".
+    :type swizzle_mode: str, optional
+    :param max_active_ctas: Number of persistent CTAs, or None to launch one CTA per tile, defaults to None.
+    :type max_active_ctas: Optional[int], optional
+    :param cta_tiler: CTA tile shape (M, N, K), defaults to the per-dtype default tile.
+    :type cta_tiler: Optional[Tuple[int, int, int]], optional
+    :param num_stages: Number of shared memory pipeline stages, defaults to 4.
+    :type num_stages: int, optional
 
     :return: Compiled kernel function.
     """
     from cutlass.cute.runtime import make_fake_stream
 
-    stream = make_fake_stream()
+    key = (
+        ab_dtype,
+        c_dtype,
+        acc_dtype,
+        tuple(atom_layout_mnk),
+        _major_modes(a, b, c),
+        epilogue_op,
+        swizzle_mode,
+        max_active_ctas,
+        cta_tiler,
+        num_stages,
+    )
+    compiled_fn = _compiled_bmm_cache.get(key)
+    if compiled_fn is None:
+        stream = make_fake_stream()
+
+        is_m_major_c = _major_modes(a, b, c)[2] == "m"
+        gemm = TensorOpGemm(
+            ab_dtype,
+            c_dtype,
+            acc_dtype,
+            atom_layout_mnk,
+            is_m_major_c,
+            swizzle_mode=swizzle_mode,
+            max_active_ctas=max_active_ctas,
+            cta_tiler=cta_tiler,
+            num_stages=num_stages,
+        )
+        compiled_fn = cute.compile(bmm, gemm, a, b, c, stream, epilogue_op)
+        _compiled_bmm_cache[key] = compiled_fn
+    return compiled_fn
+
+
+# Best (cta_tiler, atom_layout_mnk, num_stages) found by autotune_bmm, keyed on
+# the problem size, dtypes and majorness
+_autotuned_bmm_configs = {}
+
 
-    is_m_major_c = c.leading_dim == 0
-    gemm = TensorOpGemm(ab_dtype, c_dtype, acc_dtype, atom_layout_mnk, is_m_major_c)
-    return cute.compile(bmm, gemm, a, b, c, stream, epilogue_op)
+def autotune_bmm(
+    mnkl: Tuple[int, int, int, int],
+    a: cute.Tensor,
+    b: cute.Tensor,
+    c: cute.Tensor,
+    ab_dtype: Type[cutlass.Numeric],
+    c_dtype: Type[cutlass.Numeric],
+    acc_dtype: Type[cutlass.Numeric],
+    stream: cuda.CUstream,
+    warmup_iterations: int = 2,
+    iterations: int = 10,
+    **compile_kwargs,
+):
+    """
+    Pick the fastest (cta_tiler, atom_layout_mnk, num_stages) configuration
+    for a problem.
+
+    Every candidate that can be compiled for the problem is timed with
+    :func:`cutlass.testing.tune`. The winner is cached for the lifetime of the
+    process, so later calls for the same problem reuse it without tuning again.
+
+    :param mnkl: Problem size as a tuple (M, N, K, L).
+    :type mnkl: Tuple[int, int, int, int]
+    :param a: Input tensor A.
+    :type a: cute.Tensor
+    :param b: Input tensor B.
+    :type b: cute.Tensor
+    :param c: Output tensor C, overwritten while tuning.
+    :type c: cute.Tensor
+    :param ab_dtype: Data type for input tensors A and B.
+    :type ab_dtype: Type[cutlass.Numeric]
+    :param c_dtype: Data type for output tensor C.
+    :type c_dtype: Type[cutlass.Numeric]
+    :param acc_dtype: Accumulator data type.
+    :type acc_dtype: Type[cutlass.Numeric]
+    :param stream: CUDA stream the candidates are timed on.
+    :type stream: cuda.CUstream
+    :param warmup_iterations: Number of warmup iterations per candidate, defaults to 2.
+    :type warmup_iterations: int, optional
+    :param iterations: Number of timed iterations per candidate, defaults to 10.
+    :type iterations: int, optional
+    :param compile_kwargs: Additional keyword arguments forwarded to :func:`compile_bmm`.
+
+    :return: The best configuration as (cta_tiler, atom_layout_mnk, num_stages).
+    :rtype: Tuple[Tuple[int, int, int], Tuple[int, int, int], int]
+    """
+    key = (
+        tuple(mnkl),
+        ab_dtype,
+        c_dtype,
+        acc_dtype,
+        _major_modes(a, b, c),
+        tuple(sorted(compile_kwargs.items())),
+    )
+    config = _autotuned_bmm_configs.get(key)
+    if config is None:
+
+        def compile_config(a, b, c, stream, config):
+            cta_tiler, atom_layout_mnk, num_stages = config
+            compiled_fn = compile_bmm(
+                a,
+                b,
+                c,
+                ab_dtype,
+                c_dtype,
+                acc_dtype,
+                atom_layout_mnk,
+                cta_tiler=cta_tiler,
+                num_stages=num_stages,
+                **compile_kwargs,
+            )
+            return lambda: compiled_fn(a, b, c, stream)
+
+        configs = (
+            _AUTOTUNE_CONFIGS_FP8
+            if is_fp8_dtype(ab_dtype)
+            else _AUTOTUNE_CONFIGS_FP16_BF16
+        )
+        config = testing.tune(
+            compile_config,
+            params_dict={"config": list(configs)},
+            kernel_arguments=testing.JitArguments(a, b, c, stream),
+            warmup_iterations=warmup_iterations,
+            iterations=iterations,
+            stream=stream,
+        )["config"]
+        _autotuned_bmm_configs[key] = config
+    return config
 
 
 def run(
@@ -1126,6 +1512,11 @@ def run(
     skip_ref_check: bool = False,
     use_cold_l2: bool = False,
     benchmark: bool = False,
+    swizzle_mode: str = "xor",
+    persistent: bool = False,
+    autotune: bool = False,
+    use_cuda_graphs: bool = False,
+    num_stages: int = 4,
     **kwargs,
 ):
     """
@@ -1162,6 +1553,16 @@ def run(
     :type use_cold_l2: bool, optional
     :param benchmark: Whether to only benchmark the kernel, defaults to False.
     :type benchmark: bool, optional
+    :param swizzle_mode: Shared memory layout for A/B, "xor" or "packed", defaults to "xor".
+    :type swizzle_mode: str, optional
+    :param persistent: Whether to launch one persistent CTA per SM that loops over output tiles, defaults to False.
+    :type persistent: bool, optional
+    :param autotune: Whether to autotune the CTA tile, atom layout and number of stages for the problem, overriding atom_layout_mnk, defaults to False.
+    :type autotune: bool, optional
+    :param use_cuda_graphs: Whether to capture the benchmark iterations into a CUDA graph, removing per-launch host overhead from the measurement, defaults to False.
+    :type use_cuda_graphs: bool, optional
+    :param num_stages: Number of shared memory pipeline stages, clamped to the shared memory capacity, defaults to 4.
+    :type num_stages: int, optional
     :raises RuntimeError: If CUDA GPU is not available.
     :return: Execution time of the GEMM kernel.
     :rtype: float
@@ -1200,8 +1601,30 @@ def run(
         c_f32,
     )
 
+    max_active_ctas = None
+    if persistent:
+        max_active_ctas = utils.HardwareInfo().get_device_multiprocessor_count()
+
+    cta_tiler = None
+    if autotune:
+        cta_tiler, atom_layout_mnk, num_stages = autotune_bmm(
+            mnkl,
+            a_,
+            b_,
+            c_,
+            ab_dtype,
+            c_dtype,
+            acc_dtype,
+            current_stream,
+            swizzle_mode=swizzle_mode,
+            max_active_ctas=max_active_ctas,
+        )
+        print(
+            f"Autotuned config: cta_tiler {cta_tiler}, "
+            f"atom_layout_mnk {atom_layout_mnk}, num_stages {num_stages}"
+        )
+
     compiled_fn = compile_bmm(
-        mnkl,
         a_,
         b_,
         c_,
@@ -1209,7 +1632,10 @@ def run(
         c_dtype,
         acc_dtype,
         atom_layout_mnk,
-        epilogue_op=lambda x: x,
+        swizzle_mode=swizzle_mode,
+        max_active_ctas=max_active_ctas,
+        cta_tiler=cta_tiler,
+        num_stages=num_stages,
     )
 
     print("Running Ampere tensor core GEMM test with:")
@@ -1219,6 +1645,17 @@ def run(
     print(f"Iterations: {iterations}")
     print(f"Skip reference checking: {skip_ref_check}")
     print(f"Use cold L2: {'True' if use_cold_l2 else 'False'}")
+    print(f"Use CUDA graphs: {'True' if use_cuda_graphs else 'False'}")
+    print(f"Persistent CTAs: {max_active_ctas if persistent else 'False'}")
+    effective_num_stages = TensorOpGemm.clamp_num_stages(
+        ab_dtype, num_stages, cta_tiler
+    )
+    print(f"Pipeline stages: {effective_num_stages}")
+    if effective_num_stages < num_stages:
+        print(
+            f"Warning: {num_stages} pipeline stages do not fit into shared "
+            f"memory, using {effective_num_stages}"
+        )
 
     if not skip_ref_check:
         # Use small random number for deterministic result for reference check
@@ -1241,6 +1678,18 @@ def run(
     if not benchmark:
         return 0
 
+    # The iterations are timed with CUDA events recorded around the whole
+    # loop, so the host only synchronizes once. CUDA graphs additionally
+    # remove the per-launch host overhead, but cannot be captured on the
+    # legacy default stream
+    benchmark_stream = current_stream
+    if use_cuda_graphs:
+        torch_benchmark_stream = torch.cuda.Stream()
+        benchmark_stream = cuda.CUstream(torch_benchmark_stream.cuda_stream)
+
+    # Every workspace is generated directly in device memory, so there are
+    # no host -> device copies in the timed region, and each one gets its own
+    # buffers so that rotating through them keeps L2 cold
     def generate_tensors():
         a, b, c, a_f32, b_f32, c_f32 = prepare_tensors(
             mnkl,
@@ -1264,7 +1713,12 @@ def run(
             b_f32,
             c_f32,
         )
-        return testing.JitArguments(a_, b_, c_, current_stream)
+        if use_cuda_graphs:
+            # The workspace is initialized on the torch stream, which is not
+            # ordered with the benchmark stream; finish it before any kernel
+            # on the benchmark stream can read it
+            torch_stream.synchronize()
+        return testing.JitArguments(a_, b_, c_, benchmark_stream)
 
     workspace_count = 1
     if use_cold_l2:
@@ -1282,9 +1736,10 @@ def run(
         compiled_fn,
         workspace_generator=generate_tensors,
         workspace_count=workspace_count,
-        stream=current_stream,
+        stream=benchmark_stream,
         warmup_iterations=warmup_iterations,
         iterations=iterations,
+        use_cuda_graphs=use_cuda_graphs,
     )
     print(f"[DSL INFO] Execution time: {exec_time} microseconds per iteration")
     return exec_time
@@ -1314,9 +1769,23 @@ def prepare_parser():
         default=(2, 2, 1),
         help="Atom layout (comma-separated)",
     )
+    parser.add_argument(
+        "--num_stages",
+        type=int,
+        default=4,
+        help="Number of shared memory pipeline stages, clamped to the shared "
+        "memory capacity",
+    )
     parser.add_argument("--ab_dtype", type=cutlass.dtype, default=cutlass.Float16)
     parser.add_argument("--c_dtype", type=cutlass.dtype, default=cutlass.Float16)
-    parser.add_argument("--acc_dtype", type=cutlass.dtype, default=cutlass.Float32)
+    parser.add_argument(
+        "--acc_dtype",
+        type=cutlass.dtype,
+        choices=[cutlass.Float32, cutlass.Float16],
+        default=cutlass.Float32,
+        help="Accumulator data type; Float16 trades precision for fewer "
+        "accumulator registers on small-K problems",
+    )
     parser.add_argument("--a_major", choices=["k", "m"], type=str, default="m")
     parser.add_argument("--b_major", choices=["k", "n"], type=str, default="n")
     parser.add_argument("--c_major", choices=["n", "m"], type=str, default="n")
@@ -1348,6 +1817,32 @@ def prepare_parser():
         default=False,
         help="Use circular buffer tensor sets to ensure L2 cold cache",
     )
+    parser.add_argument(
+        "--swizzle_mode",
+        choices=["xor", "packed"],
+        type=str,
+        default="xor",
+        help="Shared memory layout for A/B: XOR swizzled, or packed unswizzled "
+        "atoms for K-major operands",
+    )
+    parser.add_argument(
+        "--persistent",
+        action="store_true",
+        default=False,
+        help="Launch one persistent CTA per SM that loops over output tiles",
+    )
+    parser.add_argument(
+        "--autotune",
+        action="store_true",
+        default=False,
+        help="Autotune CTA tile, atom layout and number of stages for the problem",
+    )
+    parser.add_argument(
+        "--use_cuda_graphs",
+        action="store_true",
+        default=False,
+        help="Replay the benchmark iterations from a CUDA graph",
+    )
 
     return parser
 
@@ -1387,5 +1882,10 @@ if __name__ == "__main__":
         args.skip_ref_check,
         args.use_cold_l2,
         args.benchmark == "default",
+        swizzle_mode=args.swizzle_mode,
+        persistent=args.persistent,
+        autotune=args.autotune,
+        use_cuda_graphs=args.use_cuda_graphs,
+        num_stages=args.num_stages,
     )
     print("PASS")